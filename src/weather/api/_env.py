@@ -0,0 +1,24 @@
+"""Numeric settings read from environment variables.
+
+A missing or malformed value falls back to the default, so a typo in a
+tuning knob never breaks a request.
+"""
+
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+__all__ = ["env_int", "env_float"]
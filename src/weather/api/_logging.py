@@ -2,6 +2,8 @@ from time import time
 import logging
 import os
 
+from weather.api._tracing import Span, current_trace_id
+
 
 
 def _resolve_level() -> int:
@@ -21,15 +23,20 @@ logger = logging.getLogger("weather_ai")
 
 
 class LogDuration():
+    """Log the start and duration of an activity and record it as a span."""
     start: float
     def __init__(self, activity:str, depth=0):
         self.activity = activity
         self.tabs="\t" * depth
+        self.span = Span(activity)
+    def _prefix(self):
+        trace_id = current_trace_id()
+        return f"[{trace_id[:8]}] " if trace_id else ""
     def __enter__(self):
         self.start = time()
-        logger.log(logging.INFO, f"{self.tabs}Started {self.activity}" )
+        self.span.__enter__()
+        logger.log(logging.INFO, f"{self._prefix()}{self.tabs}Started {self.activity}" )
 
     def __exit__(self, *args, **kwargs):
-        logger.log(logging.INFO, f"{self.tabs}Finished {self.activity} in {int(time() - self.start) *1000} ms")
-        
-    
\ No newline at end of file
+        self.span.__exit__(*args)
+        logger.log(logging.INFO, f"{self._prefix()}{self.tabs}Finished {self.activity} in {int((time() - self.start) * 1000)} ms")
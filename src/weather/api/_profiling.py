@@ -0,0 +1,161 @@
+"""On-demand sampling profiler for API requests.
+
+Profiling is opt-in per request: a request is profiled when it carries an
+``X-Profile-Key`` header matching ``WEATHER_PROFILE_KEY``, or when it falls
+in the sampled fraction ``PROFILE_SAMPLE_RATE`` (default 0). When neither
+applies ``ProfileRequest`` does nothing, so the cost of the disabled path
+is one header comparison and one ``random()`` call.
+
+While enabled a daemon thread samples the request thread's stack every
+``PROFILE_INTERVAL_MS`` (default 5) using ``sys._current_frames`` and the
+result is written in collapsed-stack format (``frame;frame;frame count``),
+ready for ``flamegraph.pl`` or speedscope. Files are named after the
+request_id, stored in ``PROFILE_DIR`` (default ``profiles``) and only the
+newest ``PROFILE_KEEP`` (default 50) are kept.
+"""
+
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from weather.api._env import env_float
+from weather.api._logging import logger, logging
+
+
+PROFILE_SUFFIX = ".collapsed"
+PROFILE_NAME_RE = re.compile(r"^[\w.-]+\.collapsed$")
+
+
+def profile_dir() -> str:
+    return os.environ.get("PROFILE_DIR", "profiles")
+
+
+def should_profile(profile_key: Optional[str]) -> bool:
+    """Decide whether the current request gets profiled."""
+    wanted = os.environ.get("WEATHER_PROFILE_KEY")
+    if profile_key and wanted and hmac.compare_digest(profile_key.encode(), wanted.encode()):
+        return True
+    rate = env_float("PROFILE_SAMPLE_RATE", 0.0)
+    return rate > 0 and random.random() < rate
+
+
+def _frame_label(frame) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_name}"
+
+
+class SamplingProfiler:
+    """Sample the stack of one thread from a background thread."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="weather-profiler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+class ProfileRequest:
+    """Profile the enclosed block and save the collapsed stacks.
+
+    ``name`` holds the saved profile file name once the block exits, or
+    None when profiling was disabled or nothing was sampled.
+    """
+
+    def __init__(self, request_id: str, enabled: bool):
+        self.request_id = request_id
+        self.enabled = enabled
+        self.name: Optional[str] = None
+        self.profiler: Optional[SamplingProfiler] = None
+
+    def __enter__(self):
+        if self.enabled:
+            interval = env_float("PROFILE_INTERVAL_MS", 5.0) / 1000
+            self.profiler = SamplingProfiler(threading.get_ident(), interval)
+            self.profiler.start()
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        if self.profiler is None:
+            return
+        stacks = self.profiler.stop()
+        if not stacks:
+            return
+        try:
+            self.name = _save(self.request_id, stacks)
+            logger.log(logging.INFO, f"...saved profile {self.name}")
+            _prune(profile_dir(), int(env_float("PROFILE_KEEP", 50)))
+        except OSError as exc:
+            logger.log(logging.WARNING, f"could not save profile for {self.request_id}: {exc}")
+
+
+def _save(request_id: str, stacks: Counter) -> str:
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    name = f"{time.strftime('%Y%m%dT%H%M%S')}-{request_id}{PROFILE_SUFFIX}"
+    with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    return name
+
+
+def _prune(directory: str, keep: int):
+    for name in [p["name"] for p in list_profiles()][keep:]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            # already pruned by a concurrent request
+            pass
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Return the saved profiles, newest first."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in os.listdir(directory):
+        if not PROFILE_NAME_RE.match(name):
+            continue
+        try:
+            stat = os.stat(os.path.join(directory, name))
+        except FileNotFoundError:
+            # pruned since listdir
+            continue
+        profiles.append({"name": name, "size": stat.st_size, "created": int(stat.st_mtime)})
+    return sorted(profiles, key=lambda p: p["name"], reverse=True)
+
+
+def profile_path(name: str) -> Optional[str]:
+    """Return the path of a saved profile, or None if there is no such profile."""
+    if not PROFILE_NAME_RE.match(name):
+        return None
+    path = os.path.join(profile_dir(), name)
+    return path if os.path.isfile(path) else None
+
+
+__all__ = ["should_profile", "ProfileRequest", "list_profiles", "profile_path", "SamplingProfiler"]
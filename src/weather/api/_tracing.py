@@ -0,0 +1,186 @@
+"""Lightweight request-scoped tracing.
+
+A trace is started per API request (``RequestTrace``) and every stage opens
+a ``Span`` inside it. The current trace and span live in context variables
+so nested calls (parse, geocode attempts, cache lookups, the MCP call) are
+parented automatically, and log lines from concurrent requests can be tied
+together by their trace id.
+
+The MCP server runs in a subprocess, so the trace context travels inside
+the JSON-RPC messages (``inject`` on the client, ``RemoteTrace`` on the
+server). The server sends its finished spans back in the response and the
+client merges them with ``merge_remote_spans``.
+
+Finished traces are appended to ``TRACE_EXPORT_PATH`` as OTLP/JSON lines,
+the format read by the OpenTelemetry collector ``otlpjsonfile`` receiver.
+Nothing is recorded unless ``TRACE_EXPORT_PATH`` is set; ``TRACE_SAMPLE_RATE``
+(default 1.0) picks the fraction of requests that get recorded.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import uuid
+from contextvars import ContextVar
+from time import time_ns
+from typing import Any, Dict, List, Optional
+
+from weather.api._env import env_float
+
+
+logger = logging.getLogger("weather_ai")
+
+SERVICE_NAME = "weather"
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("weather_trace", default=None)
+_current_span: ContextVar[Optional[str]] = ContextVar("weather_span", default=None)
+_export_lock = threading.Lock()
+
+
+def _should_sample() -> bool:
+    return bool(os.environ.get("TRACE_EXPORT_PATH")) and random.random() < env_float("TRACE_SAMPLE_RATE", 1.0)
+
+
+def _new_span_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Trace:
+    def __init__(self, trace_id: str, sampled: bool, root_parent: Optional[str] = None):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.root_parent = root_parent
+        self.spans: List[Dict[str, Any]] = []
+
+
+class Span:
+    """Context manager recording one span in the current trace.
+
+    A no-op when there is no current trace or it is not sampled.
+    """
+
+    def __init__(self, name: str, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self.record: Optional[Dict[str, Any]] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        trace = _current_trace.get()
+        if trace is None or not trace.sampled:
+            return self
+        self.record = {
+            "traceId": trace.trace_id,
+            "spanId": _new_span_id(),
+            "parentSpanId": _current_span.get() or trace.root_parent or "",
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(time_ns()),
+        }
+        self._trace = trace
+        self._token = _current_span.set(self.record["spanId"])
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.record is None:
+            return
+        _current_span.reset(self._token)
+        self.record["endTimeUnixNano"] = str(time_ns())
+        self.record["attributes"] = [_attribute(k, v) for k, v in self.attributes.items()]
+        self.record["status"] = {"code": 2, "message": str(exc)} if exc_type else {"code": 1}
+        self._trace.spans.append(self.record)
+
+
+class RequestTrace:
+    """Start a trace for one API request and export it when finished."""
+
+    def __init__(self, trace_id: Optional[str] = None, name: str = "request", **attributes):
+        self.trace = Trace(uuid.UUID(trace_id).hex if trace_id else uuid.uuid4().hex, _should_sample())
+        self.root = Span(name, **attributes)
+
+    def __enter__(self):
+        self._token = _current_trace.set(self.trace)
+        self.root.__enter__()
+        return self.trace
+
+    def __exit__(self, *exc_info):
+        self.root.__exit__(*exc_info)
+        _current_trace.reset(self._token)
+        if self.trace.sampled:
+            export(self.trace)
+
+
+class RemoteTrace:
+    """Continue a trace propagated in a JSON-RPC message (server side).
+
+    The spans are collected on the returned ``Trace`` and are not exported;
+    the server sends them back to the client instead.
+    """
+
+    def __init__(self, carrier: Optional[Dict[str, Any]]):
+        carrier = carrier or {}
+        self.trace = None
+        if carrier.get("trace_id"):
+            self.trace = Trace(carrier["trace_id"], bool(carrier.get("sampled")), carrier.get("parent_id"))
+
+    def __enter__(self):
+        self._token = _current_trace.set(self.trace)
+        return self.trace
+
+    def __exit__(self, *exc_info):
+        _current_trace.reset(self._token)
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.trace_id if trace else None
+
+
+def inject() -> Optional[Dict[str, Any]]:
+    """Return the trace context to embed in an outgoing JSON-RPC message."""
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    return {"trace_id": trace.trace_id, "parent_id": _current_span.get(), "sampled": trace.sampled}
+
+
+def merge_remote_spans(remote: Optional[Dict[str, Any]]):
+    """Add the spans returned by the MCP server to the current trace."""
+    trace = _current_trace.get()
+    if trace is None or not trace.sampled or not remote:
+        return
+    trace.spans.extend(remote.get("spans", []))
+
+
+def export(trace: Trace):
+    path = os.environ.get("TRACE_EXPORT_PATH")
+    if not path or not trace.spans:
+        return
+    payload = {
+        "resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{"scope": {"name": "weather.tracing"}, "spans": trace.spans}],
+        }]
+    }
+    try:
+        with _export_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(payload) + "\n")
+    except OSError as exc:
+        logger.log(logging.WARNING, f"could not export trace {trace.trace_id}: {exc}")
+
+
+__all__ = ["Span", "RequestTrace", "RemoteTrace", "current_trace_id", "inject", "merge_remote_spans", "export"]
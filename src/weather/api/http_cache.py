@@ -0,0 +1,154 @@
+"""HTTP caching helpers for the weather API.
+
+Small, dependency-free helpers used by ``weather.api.main`` to make the
+``/v1/weather/ask`` responses reusable. CDNs and other shared caches only
+store the GET form of the endpoint; POST responses are marked ``private``
+and can only be revalidated by the client (a match there is answered with
+412, not 304):
+
+- ``compute_etag`` builds a deterministic weak ETag from the normalized
+  request params and the daily data returned by the provider. Per-request
+  fields (``request_id``, ``latency_ms``) and the data source are left out,
+  so the same range answered from cache or from Open-Meteo gets the same tag.
+- ``etag_matches`` implements the weak comparison used for ``If-None-Match``.
+- ``cache_control_for`` picks a ``max-age`` depending on whether the range
+  only has settled archive days (stable) or includes recent or forecast
+  days (still revised by the provider). POST responses and responses of an
+  API key protected deployment are marked ``private``.
+- ``negotiate_encoding`` / ``compress_body`` handle gzip and brotli
+  compression for large payloads. Brotli is not available by default: the
+  ``brotli`` package is not a project dependency, so unless it is installed
+  separately only gzip is offered.
+
+Configuration (environment variables):
+- ``ARCHIVE_MAX_AGE``: max-age in seconds for settled archive ranges (default 86400)
+- ``ARCHIVE_SETTLE_DAYS``: days before a past day counts as settled (default 5);
+  the latest archive days are preliminary and get revised
+- ``FORECAST_MAX_AGE``: max-age in seconds for ranges with forecast days (default 600,
+  matching the 10 minutes weather cache)
+- ``COMPRESS_MIN_BYTES``: smallest body that gets compressed (default 1024)
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from weather.api._env import env_int
+
+try:
+	import brotli
+except ImportError:  # optional dependency
+	brotli = None
+
+
+ETAG_PARAM_KEYS = ("location", "start_date", "end_date", "units")
+# the provider returns days in the location's timezone (timezone=auto), the
+# latest local date anywhere is UTC+14
+LATEST_UTC_OFFSET = timedelta(hours=14)
+
+
+def compute_etag(params: Dict[str, Any], daily: List[Dict[str, Any]]) -> str:
+	"""Return a weak ETag for the given params and daily data.
+
+	The tag is weak because the response body also carries per-request
+	fields; two responses with the same tag are semantically equivalent.
+	"""
+	normalized = {k: str(params.get(k, "")).strip().lower() for k in ETAG_PARAM_KEYS}
+	payload = json.dumps({"params": normalized, "daily": daily}, sort_keys=True, separators=(",", ":"))
+	digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+	return f'W/"{digest}"'
+
+
+def _opaque_tag(tag: str) -> str:
+	tag = tag.strip()
+	if tag.startswith("W/"):
+		tag = tag[2:]
+	return tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+	"""Weak comparison of an ``If-None-Match`` header against ``etag``."""
+	if not if_none_match:
+		return False
+	if if_none_match.strip() == "*":
+		return True
+	wanted = _opaque_tag(etag)
+	return any(_opaque_tag(candidate) == wanted for candidate in if_none_match.split(","))
+
+
+def _latest_today() -> date:
+	return (datetime.now(timezone.utc) + LATEST_UTC_OFFSET).date()
+
+
+def cache_control_for(params: Dict[str, Any], private: bool = False, today: Optional[date] = None) -> str:
+	"""Return a ``Cache-Control`` value for the requested date range.
+
+	Ranges ending at least ``ARCHIVE_SETTLE_DAYS`` before today will not
+	change, so they can be cached for long. Ranges with recent, today's or
+	forecast days are only cached for a short time. ``today`` defaults to
+	the latest local date anywhere, so the location's timezone never makes
+	a range look older than it is.
+	"""
+	today = today or _latest_today()
+	settled = today - timedelta(days=env_int("ARCHIVE_SETTLE_DAYS", 5))
+	scope = "private" if private else "public"
+	end = date.fromisoformat(params["end_date"])
+	if end < settled:
+		return f"{scope}, max-age={env_int('ARCHIVE_MAX_AGE', 86400)}"
+	return f"{scope}, max-age={env_int('FORECAST_MAX_AGE', 600)}"
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+	weights: Dict[str, float] = {}
+	for item in header.split(","):
+		parts = [p.strip() for p in item.split(";")]
+		coding = parts[0].lower()
+		if not coding:
+			continue
+		q = 1.0
+		for param in parts[1:]:
+			if param.startswith("q="):
+				try:
+					q = float(param[2:])
+				except ValueError:
+					q = 0.0
+		weights[coding] = q
+	return weights
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+	"""Pick ``br`` or ``gzip`` from an ``Accept-Encoding`` header, or None."""
+	if not accept_encoding:
+		return None
+	weights = _parse_accept_encoding(accept_encoding)
+	wildcard = weights.get("*", 0.0)
+	offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+	best, best_q = None, 0.0
+	for coding in offered:
+		q = weights.get(coding, wildcard)
+		if q > best_q:
+			best, best_q = coding, q
+	return best
+
+
+def compress_body(body: bytes, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+	"""Compress ``body`` if it is large enough and the client accepts it.
+
+	Returns the (possibly compressed) body and the content encoding used,
+	or None when the body is returned as is.
+	"""
+	if len(body) < env_int("COMPRESS_MIN_BYTES", 1024):
+		return body, None
+	encoding = negotiate_encoding(accept_encoding)
+	if encoding == "br":
+		return brotli.compress(body), encoding
+	if encoding == "gzip":
+		return gzip.compress(body, compresslevel=6), encoding
+	return body, None
+
+
+__all__ = ["compute_etag", "etag_matches", "cache_control_for", "negotiate_encoding", "compress_body"]
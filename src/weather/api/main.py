@@ -14,6 +14,32 @@ Endpoint:
 - POST /v1/weather/ask accepts the strict request schema (location,
   start_date, end_date, units, confidence) and returns a structured
   response that includes a small summary, raw provider data and metadata.
+- GET /v1/weather/ask?query=... is the same endpoint in cacheable form.
+
+HTTP caching (see ``weather.api.http_cache``):
+- Responses carry a weak ETag (normalized params + daily data) and a
+  Cache-Control max-age. Large payloads are gzip/brotli compressed when
+  the client accepts it.
+- A GET with a matching If-None-Match returns 304 without running the
+  summary stage. GET responses are ``public`` unless WEATHER_API_KEY is
+  set, so CDNs can store them; they key on the URL, so only identical
+  query strings share an entry (the ETag still compares normalized params).
+- Shared caches do not store POST responses, so POST responses are always
+  ``private`` and only support client revalidation: a matching
+  If-None-Match returns 412 (RFC 9110 section 13.1.2), also without
+  running the summary stage.
+
+Tracing:
+- Every request runs inside a trace whose id is the request_id; see
+  ``weather.api._tracing`` for span export and sampling settings.
+
+Profiling:
+- A request is profiled when its `X-Profile-Key` header matches
+  `WEATHER_PROFILE_KEY` or it is sampled (see ``weather.api._profiling``).
+  GET /v1/admin/profiles lists recent profiles and
+  GET /v1/admin/profiles/{name} downloads one; both need the same header.
+- Every response of /v1/weather/ask (200, 304, 412 and errors) carries
+  `X-Request-Id`, and `X-Profile-Id` when the request was profiled.
 
 Error handling:
 - 400 for validation errors
@@ -22,6 +48,7 @@ Error handling:
 
 from __future__ import annotations
 
+import hmac
 import json
 import logging
 import os
@@ -31,14 +58,17 @@ import uuid
 from typing import Optional
 
 from fastapi import FastAPI, Depends, HTTPException, Header
-from fastapi.responses import HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
 from pydantic import BaseModel, Field
 if os.environ.get("RUN_MODE", "") != "REMOTE":
 	from dotenv import load_dotenv
 	load_dotenv()
 
-from weather.api._logging import LogDuration
-from weather.crew.flow import run_weather_pipeline
+from weather.api._logging import LogDuration, logger
+from weather.api._profiling import ProfileRequest, list_profiles, profile_path, should_profile
+from weather.api._tracing import RequestTrace
+from weather.api.http_cache import cache_control_for, compress_body, compute_etag, etag_matches
+from weather.crew.flow import MyAgent, prepare_weather_context, summarize_weather_context
 from weather.api.errors import *
 
 
@@ -57,6 +87,18 @@ def get_api_key(x_api_key: Optional[str] = Header(None)) -> Optional[str]:
 			raise HTTPException(status_code=401, detail="invalid or missing API key")
 	return x_api_key
 
+
+def require_profile_key(x_profile_key: Optional[str] = Header(None)) -> str:
+	"""Admin dependency for the profiles endpoints.
+
+	Unlike the API key the profile key is mandatory: if WEATHER_PROFILE_KEY
+	is not set the endpoints are disabled.
+	"""
+	wanted = os.environ.get("WEATHER_PROFILE_KEY")
+	if not wanted or not x_profile_key or not hmac.compare_digest(x_profile_key.encode(), wanted.encode()):
+		raise HTTPException(status_code=403, detail="invalid or missing profile key")
+	return x_profile_key
+
 @app.get("/")
 def root():
 	return HTMLResponse(content="WhoThat?\n", status_code=200)
@@ -66,29 +108,110 @@ def healthz():
 	return HTMLResponse(content="Service is healthy\n", status_code=200)
 
 
-@app.post("/v1/weather/ask")
-def weather_ask(req: dict, api_key: Optional[str] = Depends(get_api_key)):
+def _request_headers(request_id: str, profile: ProfileRequest) -> dict:
+	headers = {"X-Request-Id": request_id}
+	if profile.name:
+		headers["X-Profile-Id"] = profile.name
+	return headers
+
+
+def _weather_response(
+	req: dict,
+	method: str,
+	if_none_match: Optional[str],
+	accept_encoding: Optional[str],
+	x_profile_key: Optional[str],
+) -> Response:
+	"""Run the pipeline for ``req`` and build the (conditional) response.
+
+	A matching If-None-Match skips the summary stage; GET gets 304 and
+	POST 412, since only GET and HEAD may answer a match with 304.
+	"""
 	request_id = str(uuid.uuid4())
+	profile = ProfileRequest(request_id, should_profile(x_profile_key))
+	headers = {"Cache-Control": "no-store", "Vary": "Accept-Encoding"}
+	response = None
 	start = time.time()
-	with LogDuration(f"Request id: {request_id}"):
-		try:
-			out = run_weather_pipeline(req)
-		except WeatherValidationError as exc:
-			raise HTTPException(status_code=400, detail=str(exc)) from exc
-		except WeatherRateLimitError as exc:
-			raise HTTPException(status_code=429, detail=str(exc)) from exc
-		except ProviderError as exc:
-			raise HTTPException(status_code=502, detail=str(exc)) from exc
-		except FlowError as exc:
-			raise HTTPException(status_code=500, detail=str(exc)) from exc
-		except Exception as exc:
-			raise HTTPException(status_code=500, detail="internal error" + "\n\n" + str(exc)) from exc
-
-		latency_ms = int((time.time() - start) * 1000)
-
-		response = {
-			**out,
-			"latency_ms": latency_ms,
-			"request_id": request_id,
-		}
-	return HTMLResponse(content=json.dumps(response), status_code=200)
+	try:
+		with RequestTrace(request_id, f"{method} /v1/weather/ask"), LogDuration(f"Request id: {request_id}"), profile:
+			try:
+				agent = MyAgent()
+				context = prepare_weather_context(req, agent)
+				not_modified = False
+				if "error" not in context:
+					etag = compute_etag(context["params"], context["weather_raw"]["daily"])
+					headers["ETag"] = etag
+					# shared caches do not store POST responses
+					private = method != "GET" or bool(os.environ.get("WEATHER_API_KEY"))
+					headers["Cache-Control"] = cache_control_for(context["params"], private=private)
+					not_modified = etag_matches(if_none_match, etag)
+				if not_modified:
+					logger.log(logging.INFO, f"...etag {etag} matched, skipping summary")
+				else:
+					out = summarize_weather_context(context, agent)
+			except WeatherValidationError as exc:
+				raise HTTPException(status_code=400, detail=str(exc)) from exc
+			except WeatherRateLimitError as exc:
+				raise HTTPException(status_code=429, detail=str(exc)) from exc
+			except ProviderError as exc:
+				raise HTTPException(status_code=502, detail=str(exc)) from exc
+			except FlowError as exc:
+				raise HTTPException(status_code=500, detail=str(exc)) from exc
+			except Exception as exc:
+				raise HTTPException(status_code=500, detail="internal error" + "\n\n" + str(exc)) from exc
+
+			if not not_modified:
+				latency_ms = int((time.time() - start) * 1000)
+
+				response = {
+					**out,
+					"latency_ms": latency_ms,
+					"request_id": request_id,
+				}
+	except HTTPException as exc:
+		# the profile is saved once the block exits, report it on errors too
+		exc.headers = {**(exc.headers or {}), **_request_headers(request_id, profile)}
+		raise
+	headers.update(_request_headers(request_id, profile))
+	if response is None:
+		return Response(status_code=304 if method == "GET" else 412, headers=headers)
+	body, encoding = compress_body(json.dumps(response).encode("utf-8"), accept_encoding)
+	if encoding:
+		headers["Content-Encoding"] = encoding
+	return Response(content=body, status_code=200, media_type="application/json", headers=headers)
+
+
+@app.post("/v1/weather/ask")
+def weather_ask(
+	req: dict,
+	api_key: Optional[str] = Depends(get_api_key),
+	if_none_match: Optional[str] = Header(None),
+	accept_encoding: Optional[str] = Header(None),
+	x_profile_key: Optional[str] = Header(None),
+):
+	return _weather_response(req, "POST", if_none_match, accept_encoding, x_profile_key)
+
+
+@app.get("/v1/weather/ask")
+def weather_ask_get(
+	query: str,
+	api_key: Optional[str] = Depends(get_api_key),
+	if_none_match: Optional[str] = Header(None),
+	accept_encoding: Optional[str] = Header(None),
+	x_profile_key: Optional[str] = Header(None),
+):
+	"""Cacheable form of POST /v1/weather/ask, the query is passed in the URL."""
+	return _weather_response({"query": query}, "GET", if_none_match, accept_encoding, x_profile_key)
+
+
+@app.get("/v1/admin/profiles")
+def profiles_list(profile_key: str = Depends(require_profile_key)):
+	return JSONResponse(content=list_profiles())
+
+
+@app.get("/v1/admin/profiles/{name}")
+def profiles_download(name: str, profile_key: str = Depends(require_profile_key)):
+	path = profile_path(name)
+	if not path:
+		raise HTTPException(status_code=404, detail="profile not found")
+	return FileResponse(path, media_type="text/plain", filename=name)
@@ -4,6 +4,7 @@ import json
 
 from crewai import Agent
 from weather.crew.mcp_client import mcp_client
+from weather.crew.prompt import compile_summary_prompt, estimate_tokens
 from weather.crew.tasks import FetchWeatherTask, ParseTask, SummaryTask
 from weather.api._logging import LogDuration, logging, logger
 
@@ -30,10 +31,10 @@ class MyAgent(Agent):
         )
 
 
-def run_weather_pipeline(query: dict) -> dict:
+def prepare_weather_context(query: dict, agent: MyAgent) -> dict:
+    """Run the parse and fetch stages, leaving the summary for later."""
     context = query.copy()
-    agent = MyAgent()
-    
+
     logger.log(logging.DEBUG, "...runing parse")
     with LogDuration("Parse Task", 1):
         ParseTask(agent).run(context)
@@ -42,10 +43,40 @@ def run_weather_pipeline(query: dict) -> dict:
     with LogDuration("Fetcher Task",1):
         FetchWeatherTask(agent).run(context)
 
+    return context
+
+
+def _fixed_prompt_tokens(task: SummaryTask, agent: MyAgent) -> int:
+    """Estimate of the task and agent text sent along with the data table."""
+    return estimate_tokens("\n".join((agent.role, agent.goal, agent.backstory, task.description, task.expected_output)))
+
+
+def _llm_usage(agent: MyAgent):
+    """``(prompt_tokens, successful_requests)`` tracked by the agent's LLM so far, None if it does not track usage."""
+    try:
+        usage = agent.llm.get_token_usage_summary()
+        return usage.prompt_tokens, usage.successful_requests
+    except Exception:
+        return None
+
+
+def summarize_weather_context(context: dict, agent: MyAgent) -> dict:
     logger.log(logging.DEBUG, "...runing summary")
     with LogDuration("Summary Task", 1):
+        task = SummaryTask(agent)
+        fixed_tokens = _fixed_prompt_tokens(task, agent)
+        prompt = compile_summary_prompt(context, reserved_tokens=fixed_tokens)
+        # excludes crewai's own prompt template, prompt_tokens below is the real count
+        context["prompt_tokens_estimate"] = fixed_tokens + estimate_tokens(prompt)
+        used_before = _llm_usage(agent)
         with CapturePrints():
-            summary_raw: str = agent.execute_task(SummaryTask(agent), context)
+            summary_raw: str = agent.execute_task(task, prompt)
+        used_after = _llm_usage(agent)
+        # some LLM paths (e.g. non-streaming LiteLLM calls) do not record usage,
+        # the counters then stay at zero
+        if used_before and used_after and used_after[1] > used_before[1]:
+            context["prompt_tokens"] = used_after[0] - used_before[0]
+        logger.log(logging.INFO, f"...summary prompt tokens: {context.get('prompt_tokens')} (estimate {context['prompt_tokens_estimate']})")
         try:
             context["summary"] = json.loads(summary_raw)
         except Exception as e:
@@ -56,7 +87,9 @@ def run_weather_pipeline(query: dict) -> dict:
                     raise 
             
     return context
-    
-    
-    
 
+
+def run_weather_pipeline(query: dict) -> dict:
+    agent = MyAgent()
+    context = prepare_weather_context(query, agent)
+    return summarize_weather_context(context, agent)
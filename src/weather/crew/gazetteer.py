@@ -0,0 +1,245 @@
+"""Offline gazetteer for place-name geocoding.
+
+``parse_range`` used to call Nominatim for every new place name, which is
+slow and limited to about one request per second by Nominatim's usage
+policy. This module resolves common place names locally and the parser
+only falls back to Nominatim when there is no exact match. Fuzzy matches
+are a last resort, used only when Nominatim finds nothing or is
+unavailable, since a real place missing from the index would otherwise be
+sent to a similarly named city.
+
+Data:
+- A small seed of major cities is bundled in ``data/cities.tsv`` using the
+  GeoNames ``cities*.txt`` column layout.
+- A larger index can be built from a GeoNames dump
+  (https://download.geonames.org/export/dump/, e.g. ``cities15000.txt``)
+  and selected with the ``GAZETTEER_INDEX`` environment variable.
+  Set ``GAZETTEER_INDEX=off`` to always use Nominatim.
+
+Index:
+- Every name (name, ascii name, alternate names) is normalized (accents
+  stripped, lower case, punctuation to spaces) and stored in a sorted list
+  of keys with a parallel array of place ids, so lookups are a binary
+  search. Coordinates and populations are kept in ``array`` columns.
+- When several places share a name the most populous one wins; a trailing
+  country code ("Paris, US") restricts the candidates.
+- With ``fuzzy=True`` misspellings are matched with a bounded edit distance
+  against the keys sharing the same two-letter prefix.
+
+Commands:
+    python -m weather.crew.gazetteer build cities15000.txt -o gazetteer.json.gz
+    python -m weather.crew.gazetteer bench [--index gazetteer.json.gz]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import re
+import time
+import tracemalloc
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SEED_PATH = os.path.join(os.path.dirname(__file__), "data", "cities.tsv")
+
+# GeoNames cities*.txt columns
+NAME, ASCII_NAME, ALTERNATE_NAMES, LATITUDE, LONGITUDE, COUNTRY, POPULATION = 1, 2, 3, 4, 5, 8, 14
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_COUNTRY_RE = re.compile(r"^(?P<name>.+?)\s*,\s*(?P<country>[A-Za-z]{2})$")
+
+
+def normalize(name: str) -> str:
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return _NON_ALNUM_RE.sub(" ", name.lower()).strip()
+
+
+def _within_distance(a: str, b: str, limit: int) -> bool:
+    """Levenshtein distance between ``a`` and ``b`` is at most ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+class Gazetteer:
+    def __init__(self, names: List[str], countries: List[str], lat: Iterable[float], lon: Iterable[float],
+                 population: Iterable[int], keys: List[str], ids: Iterable[int]):
+        self.names = names
+        self.countries = countries
+        self.lat = array("d", lat)
+        self.lon = array("d", lon)
+        self.population = array("q", population)
+        self.keys = keys
+        self.ids = array("l", ids)
+
+    @classmethod
+    def from_geonames(cls, lines: Iterable[str], min_population: int = 0) -> "Gazetteer":
+        """Build the index from GeoNames ``cities*.txt`` formatted lines."""
+        names, countries, lat, lon, population = [], [], [], [], []
+        entries = set()
+        for line in lines:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) <= POPULATION:
+                continue
+            pop = int(cols[POPULATION] or 0)
+            if pop < min_population:
+                continue
+            place = len(names)
+            names.append(cols[NAME])
+            countries.append(cols[COUNTRY])
+            lat.append(float(cols[LATITUDE]))
+            lon.append(float(cols[LONGITUDE]))
+            population.append(pop)
+            for name in [cols[NAME], cols[ASCII_NAME], *cols[ALTERNATE_NAMES].split(",")]:
+                if key := normalize(name):
+                    entries.add((key, place))
+        entries = sorted(entries)
+        return cls(names, countries, lat, lon, population, [k for k, _ in entries], [i for _, i in entries])
+
+    @classmethod
+    def load(cls, path: str) -> "Gazetteer":
+        """Load an index written by ``save``, or build one from a GeoNames TSV."""
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            if path.endswith((".tsv", ".txt")):
+                return cls.from_geonames(f)
+            data = json.load(f)
+        return cls(data["names"], data["countries"], data["lat"], data["lon"], data["population"], data["keys"], data["ids"])
+
+    def save(self, path: str):
+        data = {
+            "names": self.names,
+            "countries": self.countries,
+            "lat": [round(v, 5) for v in self.lat],
+            "lon": [round(v, 5) for v in self.lon],
+            "population": list(self.population),
+            "keys": self.keys,
+            "ids": list(self.ids),
+        }
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    def _exact(self, key: str) -> List[int]:
+        i = bisect_left(self.keys, key)
+        places = []
+        while i < len(self.keys) and self.keys[i] == key:
+            places.append(self.ids[i])
+            i += 1
+        return places
+
+    def _fuzzy(self, key: str) -> List[int]:
+        if len(key) < 5:
+            return []
+        limit = 1 if len(key) < 10 else 2
+        prefix = key[:2]
+        i = bisect_left(self.keys, prefix)
+        places = []
+        while i < len(self.keys) and self.keys[i].startswith(prefix):
+            if _within_distance(key, self.keys[i], limit):
+                places.append(self.ids[i])
+            i += 1
+        return places
+
+    def lookup(self, query: str, fuzzy: bool = False) -> Optional[Tuple[float, float, str]]:
+        """Resolve a place name to ``(latitude, longitude, display name)``.
+
+        Only exact (normalized) names match unless ``fuzzy`` is set.
+        Returns None when nothing matches.
+        """
+        country = None
+        if m := _COUNTRY_RE.match(query.strip()):
+            query, country = m.group("name"), m.group("country").upper()
+        key = normalize(query)
+        if not key:
+            return None
+        for candidates in (self._exact, self._fuzzy) if fuzzy else (self._exact,):
+            places = [p for p in candidates(key) if not country or self.countries[p] == country]
+            if places:
+                best = max(places, key=lambda p: self.population[p])
+                return self.lat[best], self.lon[best], f"{self.names[best]}, {self.countries[best]}"
+        return None
+
+
+_gazetteer: Optional[Gazetteer] = None
+
+
+def get_gazetteer() -> Optional[Gazetteer]:
+    """Return the process wide gazetteer, loading it on first use."""
+    global _gazetteer
+    path = os.environ.get("GAZETTEER_INDEX") or SEED_PATH
+    if path == "off":
+        return None
+    if _gazetteer is None:
+        _gazetteer = Gazetteer.load(path)
+    return _gazetteer
+
+
+def lookup(query: str, fuzzy: bool = False) -> Optional[Tuple[float, float, str]]:
+    gazetteer = get_gazetteer()
+    return gazetteer.lookup(query, fuzzy) if gazetteer else None
+
+
+def _bench(path: str, rounds: int) -> Dict[str, float]:
+    tracemalloc.start()
+    gazetteer = Gazetteer.load(path)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    sample = [gazetteer.names[i] for i in range(0, len(gazetteer.names), max(len(gazetteer.names) // 100, 1))]
+    queries = {
+        "exact": sample,
+        "fuzzy": [name[:-1] + "x" for name in sample],
+        "miss": ["Nowhereland", "Qqqqq Zzzz", "Xyzzy"],
+    }
+    result = {"places": len(gazetteer.names), "keys": len(gazetteer.keys), "memory_mb": memory / 2**20}
+    for label, names in queries.items():
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for name in names:
+                gazetteer.lookup(name, fuzzy=label == "fuzzy")
+        elapsed = time.perf_counter() - start
+        result[f"{label}_us_per_lookup"] = elapsed / (rounds * len(names)) * 1e6
+    return result
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m weather.crew.gazetteer", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build an index from a GeoNames cities*.txt dump")
+    build.add_argument("source")
+    build.add_argument("-o", "--output", default="gazetteer.json.gz")
+    build.add_argument("--min-population", type=int, default=0)
+    bench = commands.add_parser("bench", help="measure lookup throughput and memory footprint")
+    bench.add_argument("--index", default=os.environ.get("GAZETTEER_INDEX") or SEED_PATH)
+    bench.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        with open(args.source, encoding="utf-8") as f:
+            gazetteer = Gazetteer.from_geonames(f, args.min_population)
+        gazetteer.save(args.output)
+        print(f"wrote {args.output}: {len(gazetteer.names)} places, {len(gazetteer.keys)} names")
+    else:
+        for key, value in _bench(args.index, args.rounds).items():
+            print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+__all__ = ["Gazetteer", "get_gazetteer", "lookup", "normalize"]
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,32 @@
 import json
 import subprocess
 from weather.api.errors import ProviderError
-from weather.mcp_weather.cache import weather_cache
+from weather.mcp_weather.cache import WeatherCache, weather_cache
+from weather.mcp_weather.grid import GridIndex, cell_key
+from weather.mcp_weather.provider import _parse_latlon
 from weather.api._logging import LogDuration, logging, logger
+from weather.api._tracing import Span, inject, merge_remote_spans
 
 
 
 def send_message(proc, message):
+    if trace := inject():
+        message = {**message, "trace": trace}
     proc.stdin.write(json.dumps(message) + "\n")
     proc.stdin.flush()
     x = proc.stdout.readline()
-    return json.loads(x)
+    response = json.loads(x)
+    merge_remote_spans(response.get("trace"))
+    return response
+
+# requested "lat,lon" key -> grid cell key in weather_cache, expires like the cache
+grid_aliases = WeatherCache()
+# cell keys in weather_cache by position, for points near a cached cell
+grid_index = GridIndex()
+weather_cache.on_expire = grid_index.remove
+
+def _cache_key(params: dict) -> str:
+    return f"{params['location']}:{params['start_date']}:{params['end_date']}:{params['units']}"
 
 def mcp_client(params: dict):
     # Launch the MCP server as a subprocess
@@ -21,13 +37,19 @@ def mcp_client(params: dict):
         text=True,
         bufsize=1,
     )
-    key = f"{params['location']}:{params['start_date']}:{params['end_date']}:{params['units']}"
+    # the cache is keyed by the provider grid cell, upstream gets the original location
+    point_key = _cache_key(params)
+    suffix = _cache_key({**params, "location": ""})
     res = None
-    if days := weather_cache.get(key):
+    with Span("cache lookup", key=point_key) as lookup:
+        key = grid_aliases.get(point_key) or grid_index.nearest(*_parse_latlon(params["location"]), suffix)
+        cached = weather_cache.get(key) if key else None
+        lookup.set_attribute("hit", cached is not None)
+    if cached:
         logger.log(logging.INFO, f"...found cache for {key}, not calling mcp")
         res =  {
-			"daily": days,
-			"source": "cached - open-meteo"
+			**cached,
+			"source": "cached - open-meteo",
 		}
     else:
           if not "fetch_weather" in send_message(ServerProcess, {
@@ -45,7 +67,11 @@ def mcp_client(params: dict):
                 })
           if error := res.get("error"):
               raise ProviderError(f"MCP error: {error}")
-          weather_cache.set(key, res["result"]["daily"])
+          res = res["result"]
+          key = cell_key(res["grid"]) + suffix
+          weather_cache.set(key, {"daily": res["daily"], "grid": res["grid"]})
+          grid_index.add(key, res["grid"], suffix)
+          grid_aliases.set(point_key, key)
         
     ServerProcess.terminate()
     return res, "fetch_weather"
@@ -12,10 +12,13 @@ Behavior:
   "metric", "celsius", "fahrenheit".
 - Validates that end_date >= start_date and that the range is at most 31 days.
 - Returns a dict with keys: location, start_date, end_date, units, confidence
+  and place (the location as written in the query, for display)
   or a structured error: {"error": "reason", "hint": "how to fix"}.
 
-This module intentionally avoids live geocoding to keep tests hermetic.
-If geocoding is required later, add it behind a feature flag.
+Place names are resolved with an exact match in the offline gazetteer
+(``weather.crew.gazetteer``) first; Nominatim is only called when there is
+no exact match, and fuzzy gazetteer matches are used only when Nominatim
+finds nothing or is unavailable.
 """
 
 from __future__ import annotations
@@ -28,6 +31,8 @@ import parsedatetime
 from datetime import date, datetime
 from geopy.geocoders import Nominatim
 from weather.api.errors import WeatherValidationError, ProviderError
+from weather.api._tracing import Span
+from weather.crew import gazetteer
 
 cal = parsedatetime.Calendar()
 geolocator = Nominatim(user_agent='myapplication')
@@ -59,6 +64,40 @@ def _format_date(dt: datetime) -> str:
 	return dt.strftime("%Y-%m-%d")
 
 
+def _geocode(location: str) -> str:
+	"""Resolve a place name to a "lat,lon" string.
+
+	Exact gazetteer matches skip Nominatim. Fuzzy gazetteer matches are
+	only used when Nominatim finds nothing or is unavailable.
+	"""
+	with Span("gazetteer lookup", location=location) as lookup:
+		place = gazetteer.lookup(location)
+		lookup.set_attribute("hit", place is not None)
+	if place:
+		return f"{place[0]},{place[1]}"
+
+	_location, unavailable = None, True
+	for x in range(3):
+		try:
+			with Span("geocode", location=location, attempt=x):
+				_location = geolocator.geocode(location)
+			unavailable = False
+			break
+		except geopy.exc.GeocoderUnavailable:
+			continue
+	if _location:
+		return f"{_location.latitude},{_location.longitude}"
+
+	with Span("gazetteer fuzzy lookup", location=location) as lookup:
+		place = gazetteer.lookup(location, fuzzy=True)
+		lookup.set_attribute("hit", place is not None)
+	if place:
+		return f"{place[0]},{place[1]}"
+	if unavailable:
+		raise ProviderError({"error": lOCATION_ERROR, "hint": GEOCODE_SERVICE_UNAVAILABLE})
+	raise WeatherValidationError({"error": lOCATION_ERROR, "hint": LOCATION_HINT.format(location=location)})
+
+
 def parse_range(payload: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
 	"""Parse a natural language weather query into structured params.
 
@@ -105,17 +144,7 @@ def parse_range(payload: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
 	# extract location from the deterministic match
 	location = m.group("location").strip().strip()
 	if not COORDINATES_RE.match(location):
-		for x in range(3):
-			try:
-				_location = geolocator.geocode(location)
-				if not _location:
-					raise WeatherValidationError({"error": lOCATION_ERROR, "hint": LOCATION_HINT.format(location=location)})
-				location = f"{_location.latitude},{_location.longitude}"
-				break
-			except geopy.exc.GeocoderUnavailable:
-				continue
-		else:
-			raise ProviderError({"error": lOCATION_ERROR, "hint": GEOCODE_SERVICE_UNAVAILABLE})
+		location = _geocode(location)
 
 	units = m.group("unit") 
 	if not units:
@@ -129,6 +158,7 @@ def parse_range(payload: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
 		"end_date": _format_date(end_date),
 		"units": units,
 		"confidence": 1.0,
+		"place": m.group("location").strip(),
 	}
 
 	return result
@@ -0,0 +1,138 @@
+"""Compact prompt encoding for the summary task.
+
+The summary LLM call used to receive the whole pipeline context (query,
+params and the verbose list-of-dicts ``weather_raw``), so prompt size grew
+linearly with the date range. ``compile_summary_prompt`` turns the daily
+data into a small pipe separated table instead:
+
+- the header names the place as written in the query, units are declared
+  once and values are rounded
+- fields the summary does not use (weather ``code``, ``source``, the raw
+  query) are dropped
+- the task prompt is kept under a token budget
+  (``SUMMARY_PROMPT_TOKEN_BUDGET``, default 1200). The caller reserves the
+  tokens of the fixed task text (description, expected output, agent role)
+  and the table gets the rest. When it does not fit, days are downsampled;
+  the coldest, hottest, wettest and windiest days are always kept so the
+  extremes reported by the summary stay correct.
+
+Token counts here are estimates at 4 characters per token, good enough for
+budgeting. The pipeline also reports the LLM's own prompt token count, but
+only when the LLM recorded usage for the summary call.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List
+
+from weather.api._env import env_int
+from weather.api._logging import logging, logger
+
+UNITS = {
+    "metric": {"temp": "C", "precip": "mm", "wind": "km/h"},
+    "imperial": {"temp": "F", "precip": "inch", "wind": "mph"},
+}
+COLUMNS = ("date", "tmin", "tmax", "precip", "wind")
+DEFAULT_TOKEN_BUDGET = 1200
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _fmt(value: Any, digits: int) -> str:
+    if value is None:
+        return "-"
+    value = round(float(value), digits)
+    if digits == 0 or value == int(value):
+        return str(int(value))
+    return f"{value:.{digits}f}"
+
+
+def _row(day: Dict[str, Any]) -> str:
+    return "|".join((
+        str(day.get("date")),
+        _fmt(day.get("tmin"), 1),
+        _fmt(day.get("tmax"), 1),
+        _fmt(day.get("precip_mm"), 1),
+        _fmt(day.get("wind_max_kph"), 0),
+    ))
+
+
+def _extreme_indexes(days: List[Dict[str, Any]]) -> set:
+    keep = set()
+    for key, pick in (("tmin", min), ("tmax", max), ("precip_mm", max), ("wind_max_kph", max)):
+        candidates = [i for i, d in enumerate(days) if d.get(key) is not None]
+        if candidates:
+            keep.add(pick(candidates, key=lambda i: days[i][key]))
+    return keep
+
+
+def downsample_days(days: List[Dict[str, Any]], max_rows: int) -> List[Dict[str, Any]]:
+    """Keep at most ``max_rows`` days, always including the extremes.
+
+    The remaining slots are filled with evenly spaced days; the result is
+    in date order. The extremes are kept even if they exceed ``max_rows``.
+    """
+    if len(days) <= max_rows:
+        return list(days)
+    keep = _extreme_indexes(days)
+    others = [i for i in range(len(days)) if i not in keep]
+    free = max_rows - len(keep)
+    if free > 0:
+        step = len(others) / free
+        keep.update(others[int(n * step)] for n in range(free))
+    return [days[i] for i in sorted(keep)]
+
+
+def _render(header: List[str], days: List[Dict[str, Any]], total: int) -> str:
+    lines = list(header)
+    if len(days) < total:
+        lines.append(f"sampled {len(days)} of {total} days, extremes kept")
+    lines.append("|".join(COLUMNS))
+    lines.extend(_row(d) for d in days)
+    return "\n".join(lines)
+
+
+def compile_summary_prompt(context: Dict[str, Any], budget: int | None = None, reserved_tokens: int = 0) -> str:
+    """Build the compact summary prompt from the pipeline context.
+
+    ``reserved_tokens`` is the part of the budget already used by the fixed
+    task text. A warning is logged when the prompt is still over budget
+    after downsampling (the extremes alone may not fit, or the fixed text
+    may already use the whole budget).
+    """
+    budget = (env_int("SUMMARY_PROMPT_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET) if budget is None else budget) - reserved_tokens
+    params = context.get("params") or {}
+    if error := context.get("error"):
+        return f"weather data unavailable: {error}"
+
+    units = UNITS.get(params.get("units", "metric"), UNITS["metric"])
+    header = [
+        f"place: {params.get('place', params.get('location'))}",
+        f"location: {params.get('location')}",
+        f"range: {params.get('start_date')}..{params.get('end_date')}",
+        f"units: temp={units['temp']} precip={units['precip']} wind={units['wind']}",
+    ]
+    days = (context.get("weather_raw") or {}).get("daily") or []
+
+    prompt = _render(header, days, len(days))
+    tokens = estimate_tokens(prompt)
+    if tokens > budget and days:
+        # shrink proportionally, then step down until the table fits
+        rows = max(int(len(days) * max(budget, 0) / tokens), 1)
+        while True:
+            prompt = _render(header, downsample_days(days, rows), len(days))
+            tokens = estimate_tokens(prompt)
+            if tokens <= budget or rows <= 1:
+                break
+            rows -= 1
+    if tokens > budget:
+        logger.log(logging.WARNING, f"summary prompt table is {tokens} tokens, over its budget of {budget} "
+                                    f"({reserved_tokens} reserved for the task text)")
+    return prompt
+
+
+__all__ = ["compile_summary_prompt", "downsample_days", "estimate_tokens"]
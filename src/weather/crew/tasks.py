@@ -48,22 +48,13 @@ class SummaryTask(Task):
         name = "Summary Task",
         description = "Summarizes the weather data into a human-readable format.",
         expected_output = """
-                ● 2–3 sentences overview + bullets for highlights.
-                ● Mention coldest/hottest day with values & dates.
-                ● Call out any day with precip_mm >= 5 (or provider’s “rainy” threshold) and
-                    wind_max_kph >= 40.
-                ● Provide a confidence score (0 to 1) for the summary accuracy.
-                ● Format the output as JSON-like string (not actual json value) with the structure:
-                {
-                "summary_text":"human-friendly synopsis (150–250 words)",
-                "highlights":{
-                "pattern":"hot/cool, wet/dry, windy/calm",
+                2-3 sentence overview + bullet highlights from the daily table (units as given in its header).
+                Name the coldest/hottest day with values & dates; call out days with precip >= 5 mm or wind >= 40 km/h (or equivalent).
+                Return a JSON-like string (not an actual json value):
+                {"summary_text":"150-250 words","highlights":{"pattern":"hot/cool, wet/dry, windy/calm",
                 "extremes":{"coldest":{"date":"...","tmin":..},"hottest":{"date":"...","tmax":..}},
-                "notable_days":[{"date":"...","note":"heavy rain"}, {"date":"...","note":"strong winds"}]
-                },
-                "confidence": float between 0 and 1
-                }
-                Style: concise, factual, no hallucinated units; mention notable days.
+                "notable_days":[{"date":"...","note":"heavy rain"}]},"confidence": float between 0 and 1}
+                Style: concise, factual, no hallucinated units.
         """,
         agent=agent
         )
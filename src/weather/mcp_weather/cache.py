@@ -6,27 +6,28 @@ from datetime import datetime
 
 
 class WeatherCache:
-    def __init__(self):
+    def __init__(self, on_expire=None):
         self.cache = {}
+        # called with every key dropped by the cleanup
+        self.on_expire = on_expire
 
     def get(self, key):
         return self.cache.get(key, [None, None])[1]
 
     def set(self, key, value):
         now = datetime.now()
-        
-        
-        if key in self.cache:
-            # update timestamp
-            self.cache[key][0] = now
-        else:
-            self.cache[key] = [now, value]
+        # always store the new value, a key can be refreshed with newer data
+        self.cache[key] = [now, value]
         self._cleanup(now)
 
     def _cleanup(self, now: datetime):
         # filter all entries older than 10 minutes
         seconds_to_keep = 10 * 60
-        self.cache = {k: v for k, v in self.cache.items() if ((now - v[0]).total_seconds()) <= seconds_to_keep}
+        expired = [k for k, v in self.cache.items() if ((now - v[0]).total_seconds()) > seconds_to_keep]
+        for k in expired:
+            del self.cache[k]
+            if self.on_expire:
+                self.on_expire(k)
 
 weather_cache = WeatherCache()
 # def weather_cache(func):
@@ -0,0 +1,206 @@
+"""Provider grid cells for caching.
+
+Geocoders return full precision coordinates, so points a few metres apart
+(or spellings that geocode slightly differently) never shared a cache
+entry although Open-Meteo answers them from the same model grid cell.
+
+Open-Meteo reports the grid cell it used (``latitude``, ``longitude``) and
+the ``elevation`` it downscaled the values to in every response. The client
+keys the weather cache on both (``cell_key``), so an entry only ever holds
+data for one cell at one elevation, and still sends the original
+coordinates upstream.
+
+A new point can only be matched to a cell that is already cached.
+``GridIndex`` buckets the cached keys by position and drops them when the
+cache expires them. A cell is reused when the point is within
+``GRID_REUSE_KM`` (default 0.5 km, half the spacing of the finest 1 km
+models) of the cell centre; the provider would pick the same grid point.
+Trade-off: the point then gets the values downscaled for the elevation of
+the point that was fetched first, not its own. Within 0.5 km this is
+usually a few metres, but on steep terrain it can be enough to shift
+temperatures by a degree or more. Set ``GRID_REUSE_KM=0`` to only reuse
+cells for points that were already requested.
+
+Benchmark of the cache hit rate on a simulated provider grid (1000
+requests, half at city centres, 2 km grid, 0.5 km radius):
+    python -m weather.mcp_weather.grid bench
+- addresses scattered 0.5 km around the centres: 0.512 -> 0.628
+- addresses scattered 5 km around the centres: 0.512 -> 0.551
+no request was answered from the wrong cell in either run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+from typing import Dict, List, Optional, Tuple
+
+from weather.api._env import env_float
+
+KM_PER_DEGREE = 111.32
+DEFAULT_REUSE_KM = 0.5
+
+
+def _reuse_km() -> float:
+    return env_float("GRID_REUSE_KM", DEFAULT_REUSE_KM)
+
+
+def distance_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """Equirectangular distance, accurate enough at grid cell scale."""
+    x = (b[1] - a[1]) * math.cos(math.radians((a[0] + b[0]) / 2))
+    y = b[0] - a[0]
+    return math.hypot(x, y) * KM_PER_DEGREE
+
+
+def cell_key(grid: List[Dict[str, float]]) -> str:
+    """Cache key part for the grid cells reported by the provider.
+
+    A range spanning the past and the future is served by two models
+    (archive and forecast), each with its own cell.
+    """
+    return ";".join(f"{cell['latitude']},{cell['longitude']},{cell.get('elevation')}" for cell in grid)
+
+
+class GridIndex:
+    """Spatial index of the cached cell keys.
+
+    Keys are bucketed by the position of their first cell in squares of
+    ``reuse_km`` side, separately for every ``suffix`` (the dates and
+    units of the request), so a lookup only checks the neighbouring
+    buckets. ``remove`` is meant to be called when the cache expires a key.
+    """
+
+    def __init__(self, reuse_km: Optional[float] = None):
+        self.reuse_km = _reuse_km() if reuse_km is None else reuse_km
+        self.step = self.reuse_km / KM_PER_DEGREE
+        self.buckets: Dict[Tuple[str, int, int], Dict[str, List[Tuple[float, float]]]] = {}
+        self.key_buckets: Dict[str, Tuple[str, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.key_buckets)
+
+    def _bucket(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.step), math.floor(lon / self.step)
+
+    def add(self, key: str, grid: List[Dict[str, float]], suffix: str):
+        if self.reuse_km <= 0 or key in self.key_buckets:
+            return
+        points = [(cell["latitude"], cell["longitude"]) for cell in grid]
+        bucket = (suffix, *self._bucket(*points[0]))
+        self.buckets.setdefault(bucket, {})[key] = points
+        self.key_buckets[key] = bucket
+
+    def remove(self, key: str):
+        bucket = self.key_buckets.pop(key, None)
+        if bucket is None:
+            return
+        entries = self.buckets[bucket]
+        del entries[key]
+        if not entries:
+            del self.buckets[bucket]
+
+    def nearest(self, lat: float, lon: float, suffix: str) -> Optional[str]:
+        """Return the nearest key within ``reuse_km`` of ``(lat, lon)``.
+
+        Every cell of the key must be within range.
+        """
+        if self.reuse_km <= 0:
+            return None
+        row, col = self._bucket(lat, lon)
+        # a degree of longitude gets shorter towards the poles
+        cols = int(1 / math.cos(math.radians(min(abs(lat) + self.step, 89.0)))) + 1
+        best, best_distance = None, self.reuse_km
+        for r in (row - 1, row, row + 1):
+            for c in range(col - cols, col + cols + 1):
+                for key, points in self.buckets.get((suffix, r, c), {}).items():
+                    distance = max(distance_km((lat, lon), point) for point in points)
+                    if distance <= best_distance:
+                        best, best_distance = key, distance
+        return best
+
+
+# a few city centres with rough relative request weights
+_BENCH_CITIES = [
+    (32.0809, 34.7806, 10), (31.7690, 35.2163, 6), (40.7143, -74.0060, 8),
+    (51.5085, -0.1257, 7), (48.8534, 2.3488, 5), (35.6895, 139.6917, 4),
+]
+
+
+def _bench_locations(n: int, spread_km: float, exact_share: float, rng: random.Random) -> List[Tuple[float, float]]:
+    """City names geocode to the same point; addresses and spelling variants scatter around it."""
+    weights = [w for _, _, w in _BENCH_CITIES]
+    locations = []
+    for _ in range(n):
+        lat, lon, _ = rng.choices(_BENCH_CITIES, weights)[0]
+        if rng.random() < exact_share:
+            locations.append((lat, lon))
+            continue
+        dlat = rng.gauss(0, spread_km) / KM_PER_DEGREE
+        dlon = rng.gauss(0, spread_km) / (KM_PER_DEGREE * math.cos(math.radians(lat)))
+        # geocoders return full precision coordinates
+        locations.append((round(lat + dlat, 7), round(lon + dlon, 7)))
+    return locations
+
+
+def _bench(n: int, spread_km: float, exact_share: float, grid_km: float, reuse_km: float) -> Dict[str, float]:
+    """Simulate the client cache against a provider grid of ``grid_km`` spacing.
+
+    The provider answers with its nearest grid point; the grid origin is
+    not aligned with round coordinates.
+    """
+    rng = random.Random(0)
+    locations = _bench_locations(n, spread_km, exact_share, rng)
+    step = grid_km / KM_PER_DEGREE
+    origin = (rng.random() * step, rng.random() * step)
+
+    def provider_cell(lat: float, lon: float) -> List[Dict[str, float]]:
+        cell_lat = origin[0] + round((lat - origin[0]) / step) * step
+        cell_lon = origin[1] + round((lon - origin[1]) / step) * step
+        return [{"latitude": round(cell_lat, 6), "longitude": round(cell_lon, 6), "elevation": 0.0}]
+
+    raw, aliases, index = set(), {}, GridIndex(reuse_km)
+    hits = {"raw": 0, "cell": 0, "wrong_cell": 0}
+    for lat, lon in locations:
+        hits["raw"] += (lat, lon) in raw
+        raw.add((lat, lon))
+        true_cell = provider_cell(lat, lon)
+        key = aliases.get((lat, lon)) or index.nearest(lat, lon, "")
+        if key:
+            hits["cell"] += 1
+            hits["wrong_cell"] += key != cell_key(true_cell)
+        else:
+            key = cell_key(true_cell)
+            index.add(key, true_cell, "")
+            aliases[(lat, lon)] = key
+    return {
+        "raw_hit_rate": hits["raw"] / n,
+        "cell_hit_rate": hits["cell"] / n,
+        "wrong_cell_rate": hits["wrong_cell"] / n,
+        "cells_cached": float(len(index)),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m weather.mcp_weather.grid", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    bench = commands.add_parser("bench", help="compare cache hit rates of point keys and provider cell keys")
+    bench.add_argument("--requests", type=int, default=1000)
+    bench.add_argument("--spread-km", type=float, nargs="+", default=[0.5, 5.0],
+                       help="scatter of addresses and spelling variants, one run per value")
+    bench.add_argument("--exact-share", type=float, default=0.5, help="share of requests at the exact city centre")
+    bench.add_argument("--grid-km", type=float, default=2.0, help="provider grid spacing")
+    bench.add_argument("--reuse-km", type=float, default=_reuse_km())
+    args = parser.parse_args(argv)
+    for spread_km in args.spread_km:
+        print(f"spread_km: {spread_km}")
+        result = _bench(args.requests, spread_km, args.exact_share, args.grid_km, args.reuse_km)
+        for key, value in result.items():
+            print(f"  {key}: {value:.3f}")
+
+
+__all__ = ["GridIndex", "cell_key", "distance_km"]
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,8 @@ from urllib.request import urlopen, Request
 from urllib.error import URLError, HTTPError
 from datetime import date, timedelta
 
+from weather.api._tracing import Span
+
 
 def _parse_latlon(location: str) -> Tuple[float, float]:
     """Parse a "lat,lon" pair from the `location` string.
@@ -97,25 +99,32 @@ class OpenMeteoProvider:
             urls.extend([url1, url2])
         return urls
     
-    def _fetch(self, *params) -> Dict[str, Any]:
+    def _fetch(self, *params) -> Tuple[list, list]:
+        """Return the daily rows and the grid cell Open-Meteo used for each URL."""
         urls = self._build_urls(*params)
         days = []
+        grid = []
         for url in urls:
             req = Request(url, headers={"User-Agent": "weather-provider/0.1"})
 
             try:
-                
-                with urlopen(req, timeout=self.timeout) as resp:
-                    body = resp.read()
-                    encoding = resp.headers.get_content_charset() or "utf-8"
-                    text = body.decode(encoding)
-                    data = json.loads(text)
+                with Span("open-meteo GET", url=url):
+                    with urlopen(req, timeout=self.timeout) as resp:
+                        body = resp.read()
+                        encoding = resp.headers.get_content_charset() or "utf-8"
+                        text = body.decode(encoding)
+                        data = json.loads(text)
             except HTTPError as exc:
                 raise RuntimeError(f"Open-Meteo HTTP error: {exc.code} {exc.reason} \nfor {url}") from exc
             except URLError as exc:
                 raise RuntimeError(f"Open-Meteo request failed: {exc.reason} \nfor {url}") from exc
             except json.JSONDecodeError as exc:
                 raise RuntimeError(f"Open-Meteo returned invalid JSON: {exc.msg} \nfor {url}") from exc
+            grid.append({
+                "latitude": data.get("latitude"),
+                "longitude": data.get("longitude"),
+                "elevation": data.get("elevation"),
+            })
             for i, date in enumerate(data["daily"]["time"]):
                 days.append({
                     "date": date,
@@ -125,7 +134,7 @@ class OpenMeteoProvider:
                     "wind_max_kph": data["daily"]["windspeed_10m_max"][i],
                     "code": data["daily"]["weathercode"][i]
                 })
-        return days
+        return days, grid
     
     def fetch(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Fetch weather data for a validated request.
@@ -133,8 +142,10 @@ class OpenMeteoProvider:
         The `request` MUST conform to the schema validated by
         `weather.crew.mcp_client.validate_request` (it will be validated here
         as well). The function returns a dictionary with keys:
-        - `meta`: echo of input metadata
-        - `data`: raw JSON returned by Open-Meteo
+        - `daily`: one row per day
+        - `grid`: latitude, longitude and elevation of the model grid cell
+          Open-Meteo used, one entry per upstream call (archive / forecast)
+        - `source`: the provider name
 
         Raises ValueError for invalid input and RuntimeError for network/API
         issues.
@@ -147,7 +158,7 @@ class OpenMeteoProvider:
         
        
         # build URL and call Open-Meteo
-        days = self._fetch(
+        days, grid = self._fetch(
             lat,
             lon,
             date.fromisoformat(request["start_date"]),
@@ -157,6 +168,7 @@ class OpenMeteoProvider:
 
         return {
             "daily": days,
+            "grid": grid,
             "source": "open-meteo"
         }
         
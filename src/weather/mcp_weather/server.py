@@ -1,41 +1,53 @@
 import sys
 import json
 
+from weather.api._tracing import RemoteTrace, Span
 from weather.mcp_weather.provider import OpenMeteoProvider
 
 def send_response(response):
     sys.stdout.write(json.dumps(response) + "\n")
     sys.stdout.flush()
 
+def with_trace(response, trace):
+    """Attach the server spans, also to error responses so failed calls are traced."""
+    if trace and trace.sampled:
+        response["trace"] = {"spans": trace.spans}
+    return response
+
 provider = OpenMeteoProvider()
 def main():
     
     for line in sys.stdin:
+        trace = None
         try:
             request = json.loads(line, strict=False)
             
             method = request.get("method")
             params = request.get("params", {})
 
-            if method == "ping":
-                result = {"reply": "pong"}
-            if method == "tools":
-                result = ["fetch_weather"]
-            elif method == "fetch_weather":
-                result = provider.fetch(params)
+            tracing = RemoteTrace(request.get("trace"))
+            trace = tracing.trace
+            with tracing:
+                with Span(f"mcp server {method}"):
+                    if method == "ping":
+                        result = {"reply": "pong"}
+                    if method == "tools":
+                        result = ["fetch_weather"]
+                    elif method == "fetch_weather":
+                        result = provider.fetch(params)
 
             response = {
                 "jsonrpc": "2.0",
                 "id": request.get("id"),
                 "result": result
             }
-            send_response(response)
+            send_response(with_trace(response, trace))
 
         except Exception as e:
-            send_response({
+            send_response(with_trace({
                 "jsonrpc": "2.0",
                 "error": str(e)
-            })
+            }, trace))
 
 
 if __name__ == "__main__":
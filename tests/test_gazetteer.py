@@ -0,0 +1,51 @@
+# tests/test_gazetteer.py
+import pytest
+from weather.crew.gazetteer import SEED_PATH, Gazetteer, main, normalize
+
+
+@pytest.fixture(scope="module")
+def gazetteer():
+    return Gazetteer.load(SEED_PATH)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Tel Aviv", "Tel Aviv, IL"),
+    ("tel-aviv", "Tel Aviv, IL"),
+    ("New York", "New York City, US"),
+    ("München", "Munich, DE"),
+    ("Sao Paulo", "São Paulo, BR"),
+    # population ranked disambiguation and country qualifier
+    ("Paris", "Paris, FR"),
+    ("Paris, US", "Paris, US"),
+    ("London, ca", "London, CA"),
+])
+def test_lookup(gazetteer, query, expected):
+    assert gazetteer.lookup(query)[2] == expected
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Barcelonna", "Barcelona, ES"),
+    ("Amsterdm", "Amsterdam, NL"),
+])
+def test_lookup_fuzzy(gazetteer, query, expected):
+    assert gazetteer.lookup(query) is None
+    assert gazetteer.lookup(query, fuzzy=True)[2] == expected
+
+
+# real places missing from the seed must not resolve to a similar name
+@pytest.mark.parametrize("query", ["NowhereLand", "", "Rio", "Paris, JP", "Bolton", "Delphi", "Parish"])
+def test_lookup_miss(gazetteer, query):
+    assert gazetteer.lookup(query) is None
+
+
+def test_normalize():
+    assert normalize("  Zürich! ") == "zurich"
+    assert normalize("Tel Aviv-Yafo") == "tel aviv yafo"
+
+
+def test_build_roundtrip(tmp_path):
+    output = tmp_path / "index.json.gz"
+    main(["build", SEED_PATH, "-o", str(output), "--min-population", "1000000"])
+    built = Gazetteer.load(str(output))
+    assert built.lookup("Tokyo")[:2] == pytest.approx((35.6895, 139.69171))
+    assert built.lookup("Haifa") is None
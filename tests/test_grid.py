@@ -0,0 +1,74 @@
+# tests/test_grid.py
+import random
+
+import pytest
+from weather.mcp_weather.grid import GridIndex, cell_key, distance_km
+
+
+suffix = ":2025-10-01:2025-10-07:metric"
+
+
+def cell(lat, lon, elevation=10.0):
+    return {"latitude": lat, "longitude": lon, "elevation": elevation}
+
+
+def test_distance_km():
+    assert distance_km((0, 0), (1, 0)) == pytest.approx(111.32, rel=1e-3)
+    assert distance_km((60, 0), (60, 1)) == pytest.approx(55.66, rel=1e-2)
+
+
+def test_cell_key():
+    grid = [cell(32.08, 34.78, 12.0), cell(32.1, 34.8, 20.0)]
+    assert cell_key(grid) == "32.08,34.78,12.0;32.1,34.8,20.0"
+    assert cell_key([cell(32.08, 34.78, 12.0)]) != cell_key([cell(32.08, 34.78, 40.0)])
+
+
+def test_nearest():
+    index = GridIndex(reuse_km=0.5)
+    first, second = [cell(32.08, 34.78)], [cell(32.085, 34.78)]
+    index.add(cell_key(first) + suffix, first, suffix)
+    index.add(cell_key(second) + suffix, second, suffix)
+    index.add(cell_key(first) + ":2025-10-02:2025-10-07:metric", first, ":2025-10-02:2025-10-07:metric")
+    # ~0.3 km from the first cell, ~0.5 km from the second
+    assert index.nearest(32.0803, 34.7831, suffix) == cell_key(first) + suffix
+    assert index.nearest(32.0803, 34.7831, ":2025-10-03:2025-10-07:metric") is None
+    assert GridIndex(reuse_km=0.2).nearest(32.0803, 34.7831, suffix) is None
+
+
+def test_disabled():
+    index = GridIndex(reuse_km=0)
+    index.add(cell_key([cell(32.08, 34.78)]) + suffix, [cell(32.08, 34.78)], suffix)
+    assert len(index) == 0
+    assert index.nearest(32.08, 34.78, suffix) is None
+
+
+def test_every_cell_must_be_in_range():
+    index = GridIndex(reuse_km=0.5)
+    grid = [cell(32.08, 34.78), cell(32.0, 34.75)]
+    index.add(cell_key(grid) + suffix, grid, suffix)
+    assert index.nearest(32.0803, 34.7831, suffix) is None
+
+
+def test_remove():
+    index = GridIndex(reuse_km=0.5)
+    grid = [cell(32.08, 34.78)]
+    index.add(cell_key(grid) + suffix, grid, suffix)
+    index.remove(cell_key(grid) + suffix)
+    index.remove("unknown")
+    assert len(index) == 0
+    assert index.buckets == {}
+    assert index.nearest(32.08, 34.78, suffix) is None
+
+
+@pytest.mark.parametrize("lat", [0.0, 32.08, 69.6])
+def test_nearest_matches_full_scan(lat):
+    rng = random.Random(1)
+    index = GridIndex(reuse_km=1.0)
+    cells = [cell(round(lat + rng.uniform(-0.05, 0.05), 5), round(rng.uniform(-0.1, 0.1), 5)) for _ in range(300)]
+    for c in cells:
+        index.add(cell_key([c]), [c], "")
+    for _ in range(300):
+        point = (lat + rng.uniform(-0.05, 0.05), rng.uniform(-0.1, 0.1))
+        in_range = [c for c in cells if distance_km(point, (c["latitude"], c["longitude"])) <= 1.0]
+        expected = min(in_range, key=lambda c: distance_km(point, (c["latitude"], c["longitude"])), default=None)
+        assert index.nearest(*point, "") == (cell_key([expected]) if expected else None)
@@ -0,0 +1,69 @@
+# tests/test_http_cache.py
+import gzip
+from datetime import date
+
+import pytest
+from weather.api.http_cache import cache_control_for, compress_body, compute_etag, etag_matches, negotiate_encoding
+
+
+params = {"location": "32.08,34.78", "start_date": "2025-10-01", "end_date": "2025-10-07", "units": "metric"}
+daily = [{"date": "2025-10-01", "tmin": 22.1, "tmax": 29.3, "precip_mm": 0.0, "wind_max_kph": 31.2, "code": 1}]
+
+
+def test_etag_is_deterministic():
+    assert compute_etag(params, daily) == compute_etag(dict(params), list(daily))
+    assert compute_etag(params, daily).startswith('W/"')
+
+
+def test_etag_changes_with_data():
+    changed = [{**daily[0], "tmax": 30.0}]
+    assert compute_etag(params, daily) != compute_etag(params, changed)
+    assert compute_etag(params, daily) != compute_etag({**params, "units": "imperial"}, daily)
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ("*", True),
+    ('"other", {etag}', True),
+    ("{strong}", True),
+    ('"other"', False),
+])
+def test_etag_matches(header, expected):
+    etag = compute_etag(params, daily)
+    if header:
+        header = header.format(etag=etag, strong=etag[2:])
+    assert etag_matches(header, etag) is expected
+
+
+def test_cache_control_archive_vs_forecast():
+    archive = cache_control_for(params, today=date(2025, 10, 20))
+    forecast = cache_control_for(params, today=date(2025, 10, 5))
+    assert archive == "public, max-age=86400"
+    assert forecast == "public, max-age=600"
+
+
+def test_cache_control_recent_archive_days_are_not_settled():
+    # ended yesterday: still preliminary
+    assert cache_control_for(params, today=date(2025, 10, 8)) == "public, max-age=600"
+    assert cache_control_for(params, today=date(2025, 10, 12)) == "public, max-age=600"
+    assert cache_control_for(params, today=date(2025, 10, 13)) == "public, max-age=86400"
+
+
+def test_cache_control_private():
+    assert cache_control_for(params, private=True, today=date(2025, 10, 20)) == "private, max-age=86400"
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+
+
+def test_compress_body_only_large_payloads():
+    small = b"{}"
+    assert compress_body(small, "gzip") == (small, None)
+    large = b'{"daily": [' + b'{"tmin": 1.0},' * 200 + b"]}"
+    body, encoding = compress_body(large, "gzip")
+    assert encoding == "gzip"
+    assert gzip.decompress(body) == large
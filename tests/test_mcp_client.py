@@ -6,6 +6,103 @@ Context comment:
 - Placeholder file: add real tests to simulate MCP interactions.
 """
 
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from weather.crew import mcp_client as client
+from weather.mcp_weather.cache import WeatherCache
+from weather.mcp_weather.grid import GridIndex
+
+
 def test_placeholder():
     # Replace with real assertions for mcp_client behavior
     assert True
+
+
+class FakeServer:
+    """Answers the tools / fetch_weather JSON-RPC calls and records the params.
+
+    The provider grid is a 0.01 degree lattice.
+    """
+
+    calls = []
+
+    def __init__(self, *args, **kwargs):
+        self.stdin = io.StringIO()
+        self.stdout = self
+
+    def readline(self):
+        request = json.loads(self.stdin.getvalue().splitlines()[-1])
+        if request["method"] == "tools":
+            return json.dumps({"id": request["id"], "result": ["fetch_weather"]})
+        FakeServer.calls.append(request["params"])
+        lat, lon = (round(float(v), 2) for v in request["params"]["location"].split(","))
+        return json.dumps({"id": request["id"], "result": {
+            "daily": [{"date": "2025-10-01", "tmin": lat, "point": request["params"]["location"]}],
+            "grid": [{"latitude": lat, "longitude": lon, "elevation": 10.0}],
+            "source": "open-meteo",
+        }})
+
+    def terminate(self):
+        pass
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    FakeServer.calls = []
+    monkeypatch.setattr(client.subprocess, "Popen", FakeServer)
+    index = GridIndex(reuse_km=0.5)
+    monkeypatch.setattr(client, "grid_index", index)
+    monkeypatch.setattr(client, "weather_cache", WeatherCache(on_expire=index.remove))
+    monkeypatch.setattr(client, "grid_aliases", WeatherCache())
+    return FakeServer
+
+
+params = {"start_date": "2025-10-01", "end_date": "2025-10-01", "units": "metric"}
+
+
+def test_nearby_points_share_provider_cell(fake_server):
+    first, _ = client.mcp_client({**params, "location": "32.0809,34.7806"})
+    second, _ = client.mcp_client({**params, "location": "32.0811,34.7809"})
+    # upstream gets the original coordinates
+    assert fake_server.calls == [{**params, "location": "32.0809,34.7806"}]
+    assert first["grid"] == second["grid"] == [{"latitude": 32.08, "longitude": 34.78, "elevation": 10.0}]
+    assert first["daily"] == second["daily"]
+    assert second["source"] == "cached - open-meteo"
+
+
+def test_repeated_point_hits_alias(fake_server):
+    # 0.7 km from its cell centre: too far for nearest-cell reuse
+    client.mcp_client({**params, "location": "32.0849,34.7849"})
+    second, _ = client.mcp_client({**params, "location": "32.0849,34.7849"})
+    assert len(fake_server.calls) == 1
+    assert second["source"] == "cached - open-meteo"
+
+
+def test_far_points_are_fetched(fake_server):
+    client.mcp_client({**params, "location": "32.0809,34.7806"})
+    client.mcp_client({**params, "location": "32.0899,34.7806"})
+    assert [c["location"] for c in fake_server.calls] == ["32.0809,34.7806", "32.0899,34.7806"]
+
+
+def test_refetched_cell_replaces_cached_data(fake_server):
+    # both points are in the 32.08,34.78 cell, the second is too far from its centre for reuse
+    client.mcp_client({**params, "location": "32.0809,34.7806"})
+    client.mcp_client({**params, "location": "32.0849,34.7849"})
+    assert len(fake_server.calls) == 2
+    cached, _ = client.mcp_client({**params, "location": "32.0809,34.7806"})
+    assert len(fake_server.calls) == 2
+    assert cached["daily"][0]["point"] == "32.0849,34.7849"
+
+
+def test_expired_cells_leave_the_index(fake_server):
+    client.mcp_client({**params, "location": "32.0809,34.7806"})
+    assert len(client.grid_index) == 1
+    for entry in client.weather_cache.cache.values():
+        entry[0] = datetime.now() - timedelta(minutes=11)
+    client.weather_cache.set("other", {})
+    assert len(client.grid_index) == 0
+    client.mcp_client({**params, "location": "32.0811,34.7809"})
+    assert len(fake_server.calls) == 2
@@ -1,5 +1,8 @@
 # tests/test_task_parser.py
+from types import SimpleNamespace
+
 import pytest
+from weather.crew import parser
 from weather.crew.parser import parse_range, EMPTY_QUERY_ERROR, DATE_RANGE_ERROR, DATE_ORDER_ERROR, lOCATION_ERROR, PARSE_ERROR, DATE_PARSE_ERROR
 
 
@@ -43,3 +46,38 @@ def test_parse_range_invalid(input_query, expected_error):
     assert "error" in result, input_query
     assert expected_error in result["error"]
 
+
+
+class FakeGeolocator:
+    def __init__(self, result=None):
+        self.result = result
+        self.calls = []
+
+    def geocode(self, location):
+        self.calls.append(location)
+        return self.result
+
+
+def test_gazetteer_hit_skips_nominatim(monkeypatch):
+    geolocator = FakeGeolocator()
+    monkeypatch.setattr(parser, "geolocator", geolocator)
+    result = parse_range({"query": "Weather in Tel Aviv from 2025-10-01 to 2025-10-07"})
+    assert result["location"] == "32.08088,34.78057"
+    assert geolocator.calls == []
+
+
+def test_gazetteer_miss_calls_nominatim(monkeypatch):
+    geolocator = FakeGeolocator(SimpleNamespace(latitude=53.578, longitude=-2.429))
+    monkeypatch.setattr(parser, "geolocator", geolocator)
+    # "Bolton" is one edit away from "Boston" in the gazetteer
+    result = parse_range({"query": "Weather in Bolton from 2025-10-01 to 2025-10-07"})
+    assert result["location"] == "53.578,-2.429"
+    assert geolocator.calls == ["Bolton"]
+
+
+def test_fuzzy_match_only_when_nominatim_finds_nothing(monkeypatch):
+    geolocator = FakeGeolocator(None)
+    monkeypatch.setattr(parser, "geolocator", geolocator)
+    result = parse_range({"query": "Weather in Barcelonna from 2025-10-01 to 2025-10-07"})
+    assert result["location"] == "41.38879,2.15899"
+    assert geolocator.calls == ["Barcelonna"]
@@ -0,0 +1,78 @@
+# tests/test_profiling.py
+import os
+import time
+
+import pytest
+from weather.api._profiling import ProfileRequest, list_profiles, profile_path, should_profile
+
+
+@pytest.fixture
+def profiles(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("PROFILE_INTERVAL_MS", "1")
+    return tmp_path
+
+
+def busy_wait(seconds):
+    end = time.time() + seconds
+    while time.time() < end:
+        pass
+
+
+def test_should_profile(monkeypatch):
+    monkeypatch.delenv("PROFILE_SAMPLE_RATE", raising=False)
+    monkeypatch.setenv("WEATHER_PROFILE_KEY", "secret")
+    assert should_profile("secret")
+    assert not should_profile("wrong")
+    assert not should_profile(None)
+    monkeypatch.setenv("PROFILE_SAMPLE_RATE", "1")
+    assert should_profile(None)
+
+
+def test_disabled_does_nothing(profiles):
+    with ProfileRequest("req-1", False) as profile:
+        busy_wait(0.02)
+    assert profile.name is None
+    assert list_profiles() == []
+
+
+def test_profile_saved_as_collapsed_stacks(profiles):
+    with ProfileRequest("req-2", True) as profile:
+        busy_wait(0.05)
+    assert profile.name.endswith("req-2.collapsed")
+    assert [p["name"] for p in list_profiles()] == [profile.name]
+    lines = open(profile_path(profile.name)).read().splitlines()
+    assert any("test_profiling:busy_wait" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+
+
+def test_profile_path_rejects_traversal(profiles):
+    assert profile_path("../secret.collapsed") is None
+    assert profile_path("missing.collapsed") is None
+
+
+def test_concurrent_prune_keeps_profile_id(profiles, monkeypatch):
+    monkeypatch.setenv("PROFILE_KEEP", "1")
+    with ProfileRequest("req-3", True):
+        busy_wait(0.02)
+    remove = os.remove
+
+    def racing_remove(path):
+        # another request pruned the file first
+        remove(path)
+        remove(path)
+
+    monkeypatch.setattr(os, "remove", racing_remove)
+    with ProfileRequest("req-4", True) as profile:
+        busy_wait(0.02)
+    assert profile.name.endswith("req-4.collapsed")
+    assert [p["name"] for p in list_profiles()] == [profile.name]
+
+
+def test_list_profiles_skips_pruned_files(profiles, monkeypatch):
+    with ProfileRequest("req-5", True):
+        busy_wait(0.02)
+    listdir = os.listdir
+    monkeypatch.setattr(os, "listdir", lambda path: listdir(path) + ["20000101T000000-gone.collapsed"])
+    assert len(list_profiles()) == 1
@@ -0,0 +1,82 @@
+# tests/test_prompt.py
+import pytest
+from weather.crew.prompt import compile_summary_prompt, downsample_days, estimate_tokens
+
+
+def make_context(n_days, units="metric"):
+    daily = [
+        {"date": f"2025-10-{i + 1:02d}", "tmin": 15.04 + i % 5, "tmax": 25.46 + i % 7,
+         "precip_mm": 0.0 if i % 4 else 6.3, "wind_max_kph": 20.3 + i, "code": 1}
+        for i in range(n_days)
+    ]
+    if n_days > 3:
+        daily[3]["tmin"] = 2.0
+    return {
+        "query": "Weather in Tel Aviv from 2025-10-01 to 2025-10-31",
+        "params": {"location": "32.08,34.78", "place": "Tel Aviv", "start_date": "2025-10-01", "end_date": f"2025-10-{n_days:02d}", "units": units},
+        "weather_raw": {"daily": daily, "source": "open-meteo"},
+    }
+
+
+def test_prompt_is_compact_table():
+    prompt = compile_summary_prompt(make_context(3), budget=1000)
+    lines = prompt.splitlines()
+    assert "units: temp=C precip=mm wind=km/h" in lines
+    assert "date|tmin|tmax|precip|wind" in lines
+    assert "2025-10-01|15|25.5|6.3|20" in lines
+    assert "place: Tel Aviv" in lines
+    assert "open-meteo" not in prompt and "Weather in" not in prompt
+
+
+def test_reserved_tokens_shrink_the_table():
+    full = compile_summary_prompt(make_context(31), budget=1000)
+    reserved = compile_summary_prompt(make_context(31), budget=1000, reserved_tokens=900)
+    assert "sampled" not in full
+    assert "sampled" in reserved
+    assert estimate_tokens(reserved) <= 100
+
+
+def test_imperial_units_declared():
+    assert "units: temp=F precip=inch wind=mph" in compile_summary_prompt(make_context(2, "imperial"))
+
+
+@pytest.mark.parametrize("budget", [80, 120, 200])
+def test_budget_is_enforced_and_extremes_kept(budget):
+    prompt = compile_summary_prompt(make_context(31), budget=budget)
+    assert estimate_tokens(prompt) <= budget
+    assert "sampled" in prompt
+    assert "2025-10-04|2" in prompt  # coldest day
+    assert "2025-10-31|" in prompt  # windiest day
+
+
+def test_downsample_keeps_order():
+    days = make_context(31)["weather_raw"]["daily"]
+    sampled = downsample_days(days, 10)
+    assert len(sampled) == 10
+    assert [d["date"] for d in sampled] == sorted(d["date"] for d in sampled)
+
+
+def test_error_context():
+    assert "unavailable" in compile_summary_prompt({"error": "boom"})
+
+
+def test_over_budget_is_logged(caplog):
+    # the four extreme days alone do not fit
+    compile_summary_prompt(make_context(31), budget=10)
+    assert "over its budget of 10" in caplog.text
+
+
+def test_reserved_tokens_can_use_the_whole_budget(caplog):
+    prompt = compile_summary_prompt(make_context(31), budget=100, reserved_tokens=150)
+    assert "sampled" in prompt
+    assert "over its budget of -50" in caplog.text
+
+
+def test_explicit_zero_budget_is_not_the_default(caplog):
+    compile_summary_prompt(make_context(3), budget=0)
+    assert "over its budget of 0" in caplog.text
+
+
+def test_within_budget_is_not_logged(caplog):
+    compile_summary_prompt(make_context(3), budget=1000)
+    assert "over its budget" not in caplog.text
@@ -0,0 +1,75 @@
+# tests/test_tracing.py
+import json
+import os
+import subprocess
+import sys
+import uuid
+
+from weather.api._tracing import RemoteTrace, RequestTrace, Span, current_trace_id, inject, merge_remote_spans
+
+
+def read_spans(path):
+    lines = path.read_text().splitlines()
+    assert len(lines) == 1
+    return json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+
+def test_spans_are_nested_and_exported(tmp_path, monkeypatch):
+    export = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("TRACE_EXPORT_PATH", str(export))
+    request_id = str(uuid.uuid4())
+    with RequestTrace(request_id, "request"):
+        assert current_trace_id() == uuid.UUID(request_id).hex
+        with Span("outer"):
+            with Span("inner", attempt=1) as inner:
+                inner.set_attribute("hit", True)
+
+    spans = {s["name"]: s for s in read_spans(export)}
+    assert set(spans) == {"request", "outer", "inner"}
+    assert spans["inner"]["parentSpanId"] == spans["outer"]["spanId"]
+    assert spans["outer"]["parentSpanId"] == spans["request"]["spanId"]
+    assert {"key": "hit", "value": {"boolValue": True}} in spans["inner"]["attributes"]
+    assert current_trace_id() is None
+
+
+def test_remote_spans_are_merged(tmp_path, monkeypatch):
+    export = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("TRACE_EXPORT_PATH", str(export))
+    with RequestTrace():
+        with Span("mcp call"):
+            carrier = json.loads(json.dumps(inject()))
+            # server side
+            with RemoteTrace(carrier) as trace:
+                with Span("open-meteo GET"):
+                    pass
+            merge_remote_spans(json.loads(json.dumps({"spans": trace.spans})))
+
+    spans = {s["name"]: s for s in read_spans(export)}
+    assert spans["open-meteo GET"]["parentSpanId"] == spans["mcp call"]["spanId"]
+    assert spans["open-meteo GET"]["traceId"] == spans["mcp call"]["traceId"]
+
+
+def test_not_sampled(tmp_path, monkeypatch):
+    export = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("TRACE_EXPORT_PATH", str(export))
+    monkeypatch.setenv("TRACE_SAMPLE_RATE", "0")
+    with RequestTrace():
+        with Span("ignored"):
+            assert inject()["sampled"] is False
+    assert not export.exists()
+
+
+def test_server_returns_spans_with_errors():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    request = {"jsonrpc": "2.0", "id": 2, "method": "fetch_weather", "params": {"location": "bad"},
+               "trace": {"trace_id": "abc", "parent_id": "p1", "sampled": True}}
+    out = subprocess.run(
+        [sys.executable, os.path.join(root, "src", "weather", "mcp_weather", "server.py")],
+        input=json.dumps(request) + "\n", capture_output=True, text=True, timeout=30,
+        env={**os.environ, "PYTHONPATH": os.path.join(root, "src")},
+    )
+    response = json.loads(out.stdout)
+    assert "error" in response
+    [failed] = response["trace"]["spans"]
+    assert failed["parentSpanId"] == "p1"
+    assert failed["status"]["code"] == 2